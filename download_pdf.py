@@ -1,7 +1,7 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
-#     "httpx>=0.27.0",
+#     "httpx[http2]>=0.27.0",
 # ]
 # ///
 """
@@ -13,7 +13,10 @@ Usage:
     uv run download_pdf.py
 """
 
+import asyncio
+import os
 import sys
+import time
 from pathlib import Path
 
 import httpx
@@ -21,29 +24,99 @@ import httpx
 PDF_URL = "https://cestina-pro-cizince.cz/obcanstvi/wp-content/uploads/2025/12/OBC_databanka_testovychuloh_251215.pdf"
 PDF_FILENAME = "OBC_databanka_testovychuloh_251215.pdf"
 
+CHUNK_SIZE = 1 << 20  # 1 MiB
+QUEUE_SIZE = 4  # chunks buffered between network reader and file writer
+PROGRESS_INTERVAL = 0.25  # seconds between progress updates
 
-def download_pdf(url: str, output_path: Path) -> bool:
-    """Download PDF with progress indication."""
-    print(f"Downloading: {url}")
-    print(f"Saving to: {output_path}")
 
-    try:
-        with httpx.stream("GET", url, follow_redirects=True, timeout=60.0) as response:
-            response.raise_for_status()
+def print_progress(downloaded: int, total: int) -> None:
+    """Print download progress on the current terminal line."""
+    pct = downloaded * 100 // total
+    print(f"\r  Progress: {pct}% ({downloaded:,} / {total:,} bytes)", end="")
+
+
+async def _download(url: str, part_path: Path) -> None:
+    """
+    Stream url to part_path, overlapping network reads with file writes.
+
+    If part_path already holds the start of the file, only the rest is
+    requested (HTTP Range) and appended to it.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    start = part_path.stat().st_size if part_path.exists() else 0
+    headers = {"Range": f"bytes={start}-"} if start else {}
 
-            total = int(response.headers.get("content-length", 0))
-            downloaded = 0
+    limits = httpx.Limits(max_keepalive_connections=4)
+    async with httpx.AsyncClient(http2=True, limits=limits, follow_redirects=True, timeout=60.0) as client:
+        async with client.stream("GET", url, headers=headers) as response:
+            if start and response.status_code == 416:
+                # Range not satisfiable: done if the partial file is already complete
+                if response.headers.get("content-range") == f"bytes */{start}":
+                    return
+                part_path.unlink()
+            response.raise_for_status()
 
-            with open(output_path, "wb") as f:
-                for chunk in response.iter_bytes(chunk_size=8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total:
-                        pct = downloaded * 100 // total
-                        print(f"\r  Progress: {pct}% ({downloaded:,} / {total:,} bytes)", end="")
+            if response.status_code == 206:
+                print(f"  Resuming from {start:,} bytes")
+                mode = "ab"
+            else:
+                start = 0  # server ignored the Range header
+                mode = "wb"
+
+            length = int(response.headers.get("content-length", 0))
+            total = start + length if length else 0
+
+            async def reader():
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    await queue.put(chunk)
+                await queue.put(None)
+
+            async def writer():
+                downloaded = start
+                last_report = 0.0
+                with open(part_path, mode) as f:
+                    while (chunk := await queue.get()) is not None:
+                        await loop.run_in_executor(None, f.write, chunk)
+                        downloaded += len(chunk)
+                        now = time.monotonic()
+                        if total and now - last_report >= PROGRESS_INTERVAL:
+                            last_report = now
+                            print_progress(downloaded, total)
+                if total:
+                    print_progress(downloaded, total)
+
+            reader_task = asyncio.create_task(reader())
+            writer_task = asyncio.create_task(writer())
+            await asyncio.wait((reader_task, writer_task), return_when=asyncio.FIRST_EXCEPTION)
+
+            if writer_task.done() and writer_task.exception():
+                # Writing failed: stop reading and report the write error
+                reader_task.cancel()
+                await asyncio.gather(reader_task, return_exceptions=True)
+                raise writer_task.exception()
+            if reader_task.exception():
+                # Reading failed: write the chunks already received, then report it
+                await queue.put(None)
+                await writer_task
+                raise reader_task.exception()
 
             print()  # newline after progress
 
+
+def download_pdf(url: str, output_path: Path) -> bool:
+    """Download PDF with progress indication, resuming an interrupted download."""
+    print(f"Downloading: {url}")
+    print(f"Saving to: {output_path}")
+
+    # Download into a .part file so an interrupted download can be resumed
+    part_path = output_path.with_name(output_path.name + ".part")
+
+    try:
+        asyncio.run(_download(url, part_path))
+        os.replace(part_path, output_path)
+
         size = output_path.stat().st_size
         print(f"Downloaded: {size:,} bytes")
         return True
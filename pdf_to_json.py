@@ -2,6 +2,7 @@
 # requires-python = ">=3.10"
 # dependencies = [
 #     "pymupdf>=1.23.0",
+#     "orjson>=3.9.0",
 # ]
 # ///
 """
@@ -14,292 +15,369 @@ Usage:
     uv run pdf_to_json.py <input.pdf> [output.json]
 """
 
-import json
+import functools
+import operator
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass, field
 from typing import Optional
 
 import fitz  # PyMuPDF
+import orjson
 
+# Precompiled patterns used on the per-line parsing path
+_SECTION_RE = re.compile(r'^(\d+)\.\s+([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ\s,0-9.]+)$')
+_QUESTION_RE = re.compile(r'^(\d+)\.\s*(.*)')
+_ANSWER_RE = re.compile(r'(\d+)([A-D])')
+_DATE_RE = re.compile(r'Datum aktualizace testové úlohy:\s*(.+)')
 
-@dataclass
-class Option:
-    label: str  # A, B, C, D
-    text: str
-    image: Optional[str] = None  # relative path to image file
 
+# Keys left out of the JSON output when not set
+_OPTIONAL_KEYS = frozenset({"image", "date"})
 
-@dataclass
-class Question:
-    id: int
-    text: str
-    options: list[Option] = field(default_factory=list)
-    correct: str = ""  # A, B, C, or D
-    image: Optional[str] = None  # image in question itself
-    date: Optional[str] = None  # update date
-    page: int = 0  # page number where question appears
 
+def new_option(label: str, text: str) -> dict:
+    """Create an option in its JSON shape."""
+    return {
+        "label": label,  # A, B, C, D
+        "text": text,
+        "image": None,  # relative path to image file
+    }
+
+
+def new_question(id: int, text: str, page: int) -> dict:
+    """Create a question in its JSON shape (plus 'page', dropped on output)."""
+    return {
+        "id": id,
+        "text": text,
+        "options": [],
+        "correct": "",  # A, B, C, or D
+        "image": None,  # image in question itself
+        "date": None,  # update date
+        "page": page,  # page number where question appears
+    }
+
+
+def new_section(id: int, name: str) -> dict:
+    """Create a section in its JSON shape."""
+    return {"id": id, "name": name, "questions": []}
 
-@dataclass
-class Section:
-    id: int
-    name: str
-    questions: list[Question] = field(default_factory=list)
 
+def new_quiz_data(source_file: str) -> dict:
+    """Create the top-level quiz data in its JSON shape."""
+    return {"source_file": source_file, "sections": []}
 
-@dataclass
-class QuizData:
-    source_file: str
-    sections: list[Section] = field(default_factory=list)
 
+IMAGE_WRITERS = 4  # background threads writing image files in each worker process
 
-def extract_images_from_page(page: fitz.Page, output_dir: Path, page_num: int) -> list[dict]:
-    """Extract all images from a page and return their info."""
+
+def write_image(image_path: Path, image_bytes: bytes) -> None:
+    """Write an image file atomically (temp file, then rename)."""
+    tmp_path = image_path.with_name(image_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(image_bytes)
+        os.replace(tmp_path, image_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def extract_images_from_page(page: fitz.Page, output_dir: Path, page_num: int,
+                             writer: Optional[ThreadPoolExecutor] = None) -> list[dict]:
+    """
+    Extract all images from a page and return their info.
+
+    If writer is given, image files are written in the background and each
+    returned image carries the pending write as 'write' (a Future).
+    """
     images = []
     image_list = page.get_images(full=True)
+    seen_xrefs = {}  # {xref: (image_bytes, image_ext, rect)} for images listed more than once
 
     for img_idx, img_info in enumerate(image_list, 1):
         xref = img_info[0]
         try:
-            base_image = page.parent.extract_image(xref)
-            image_bytes = base_image["image"]
-            image_ext = base_image["ext"]
-
-            # Get image position on page
-            img_rects = page.get_image_rects(xref)
-            rect = img_rects[0] if img_rects else None
+            if xref in seen_xrefs:
+                image_bytes, image_ext, rect = seen_xrefs[xref]
+            else:
+                base_image = page.parent.extract_image(xref)
+                image_bytes = base_image["image"]
+                image_ext = base_image["ext"]
+
+                # Get image position on page
+                img_rects = page.get_image_rects(xref)
+                rect = img_rects[0] if img_rects else None
+                seen_xrefs[xref] = (image_bytes, image_ext, rect)
 
             # Save image
             image_filename = f"page{page_num:02d}_img{img_idx:02d}.{image_ext}"
             image_path = output_dir / image_filename
-            with open(image_path, "wb") as f:
-                f.write(image_bytes)
+            if writer is None:
+                write_image(image_path, image_bytes)
 
-            images.append({
+            y_pos = rect.y0 if rect else 0
+            image = {
                 "filename": image_filename,
                 "page": page_num,
                 "rect": rect,
-                "y_pos": rect.y0 if rect else 0,
-            })
+                "y_pos": y_pos,
+                # Reading order: row (100px tolerance), then X within the row
+                "sort_key": (round(y_pos / 100), rect.x0 if rect else 0),
+            }
+            if writer is not None:
+                image["write"] = writer.submit(write_image, image_path, image_bytes)
+            images.append(image)
         except Exception as e:
             print(f"  Warning: Could not extract image {img_idx} on page {page_num}: {e}")
 
     return images
 
 
-def cleanup_tiny_images(images_dir: Path, min_size: int = 200) -> int:
-    """Delete images smaller than min_size bytes (artifacts)."""
-    deleted = 0
-    for img_path in images_dir.iterdir():
-        if img_path.is_file() and img_path.stat().st_size < min_size:
-            img_path.unlink()
-            deleted += 1
+def extract_pages(pdf_path: Path, images_dir: Path, page_nums: range) -> list[tuple[int, str, list[dict]]]:
+    """Extract text and images from a range of pages (runs in a worker process)."""
+    results = []
+    with fitz.open(pdf_path) as doc, ThreadPoolExecutor(max_workers=IMAGE_WRITERS) as writer:
+        for page_num in page_nums:
+            page = doc[page_num]
+            page_images = extract_images_from_page(page, images_dir, page_num + 1, writer)
+            results.append((page_num + 1, page.get_text(), page_images))
+
+    # All image writes have finished once the writer pool is shut down
+    for _, _, page_images in results:
+        for image in list(page_images):
+            error = image.pop("write").exception()
+            if error:
+                print(f"  Warning: Could not write image {image['filename']}: {error}")
+                page_images.remove(image)
+    return results
+
+
+def cleanup_tiny_images(images_dir: Path, min_size: int = 200) -> set[str]:
+    """Delete images smaller than min_size bytes (artifacts) and return their filenames."""
+    deleted = set()
+    with os.scandir(images_dir) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False) and entry.stat().st_size < min_size:
+                os.unlink(entry.path)
+                deleted.add(entry.name)
     return deleted
 
 
+@functools.lru_cache(maxsize=256)
 def parse_answers_line(line: str) -> dict[int, str]:
-    """Parse 'SPRÁVNÉ ŘEŠENÍ: 1C, 2C, 3D...' into {1: 'C', 2: 'C', 3: 'D', ...}"""
+    """
+    Parse 'SPRÁVNÉ ŘEŠENÍ: 1C, 2C, 3D...' into {1: 'C', 2: 'C', 3: 'D', ...}
+
+    Results are cached per line, so the returned dict must not be modified.
+    """
     answers = {}
-    matches = re.findall(r'(\d+)([A-D])', line)
+    matches = _ANSWER_RE.findall(line)
     for num, letter in matches:
         answers[int(num)] = letter
     return answers
 
 
+@functools.lru_cache(maxsize=1024)
 def clean_text(text: str) -> str:
     """Clean up text by normalizing whitespace."""
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return ' '.join(text.split())
 
 
-def parse_pdf(pdf_path: Path, output_dir: Path) -> QuizData:
-    """Parse PDF and extract all questions with images."""
-    doc = fitz.open(pdf_path)
+# Line kinds produced by _classify
+PAGE_NUM, HEADER, SECTION, ANSWERS, QUESTION, OPTION, DATE, CONT = range(8)
 
-    # Create images directory
-    images_dir = output_dir / f"{pdf_path.stem}_images"
-    images_dir.mkdir(exist_ok=True)
+_HEADER_LINES = frozenset({"TESTOVÉ ÚLOHY", "OBČANSKÝ ZÁKLAD"})
 
-    quiz_data = QuizData(source_file=pdf_path.name)
 
-    # Track content per page for later image association
-    page_content = {}  # {page_num: {'text': str, 'images': [...]}}
-    all_images = []
+def _classify(line: str) -> tuple:
+    """
+    Classify a stripped, non-empty line as (kind, ends_block, *groups).
+
+    ends_block tells whether the line terminates a multi-line question or
+    option text; any other line is appended to the text being collected.
+    """
+    # The numbered-line patterns can only match lines starting with a digit
+    numbered = line[0].isdecimal()
+
+    # Page numbers and headers
+    if numbered and line.isdecimal():
+        return (PAGE_NUM, False)
+    if line in _HEADER_LINES:
+        return (HEADER, False)
+
+    # Section header (the pattern only admits uppercase letters in the name)
+    if numbered:
+        section_match = _SECTION_RE.match(line)
+        if section_match:
+            return (SECTION, True, int(section_match.group(1)), section_match.group(2).strip())
 
-    # First pass: extract text and images per page
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        page_text = page.get_text()
+    # Answers line
+    if "SPRÁVNÉ ŘEŠENÍ" in line:
+        return (ANSWERS, True)
 
-        # Extract images with positions
-        page_images = extract_images_from_page(page, images_dir, page_num + 1)
-        all_images.extend(page_images)
+    # Numbered line, only a question if it looks like one.
+    # It ends a block only when whitespace follows the number.
+    if numbered:
+        question_match = _QUESTION_RE.match(line)
+        if question_match:
+            ends_block = question_match.start(2) > question_match.end(1) + 1
+            q_num = int(question_match.group(1))
+            if not line.isupper() and (q_num <= 10 or '?' in line):
+                return (QUESTION, ends_block, q_num, question_match.group(2))
+            return (CONT, ends_block)
 
-        page_content[page_num + 1] = {
-            'text': page_text,
-            'images': page_images
-        }
+    # Option "A) text"
+    if line[1:2] == ')' and line[0] in 'ABCD':
+        return (OPTION, True, line[0], line[2:].lstrip())
 
-    doc.close()
+    if line.startswith("Datum aktualizace"):
+        date_match = _DATE_RE.match(line)
+        if date_match:
+            return (DATE, True, date_match.group(1).strip())
+        return (CONT, True)
+
+    return (CONT, False)
+
+
+def parse_pdf(pdf_path: Path, output_dir: Path) -> dict:
+    """Parse PDF and extract all questions with images."""
+    # Create images directory
+    images_dir = output_dir / f"{pdf_path.stem}_images"
+    images_dir.mkdir(exist_ok=True)
+
+    quiz_data = new_quiz_data(pdf_path.name)
+
+    # Track content per page for later image association
+    page_texts = {}  # {page_num: text}
+    images_by_page = {}  # {page_num: [image, ...]}
+
+    # First pass: extract text and images per page, splitting the pages
+    # into contiguous ranges handled by separate worker processes
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+    workers = max(1, min(os.cpu_count() or 1, page_count))
+    chunk_size = max(1, -(-page_count // workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(extract_pages, pdf_path, images_dir,
+                            range(start, min(start + chunk_size, page_count)))
+            for start in range(0, page_count, chunk_size)
+        ]
+        for future in futures:
+            for page_num, page_text, page_images in future.result():
+                page_texts[page_num] = page_text
+                images_by_page[page_num] = page_images
 
     # Cleanup tiny artifact images (< 200 bytes)
     deleted = cleanup_tiny_images(images_dir)
     if deleted:
-        print(f"  Deleted {deleted} artifact images")
+        print(f"  Deleted {len(deleted)} artifact images")
         # Filter out deleted images from our tracking list
-        all_images = [img for img in all_images
-                      if (images_dir / img['filename']).exists()]
-
-    # Build full text with page markers
-    lines_with_pages = []  # [(line, page_num), ...]
-    for page_num in sorted(page_content.keys()):
-        page_text = page_content[page_num]['text']
+        for page, imgs in images_by_page.items():
+            images_by_page[page] = [img for img in imgs
+                                    if img['filename'] not in deleted]
+
+    # Build full text with page markers, stripping lines once and dropping
+    # empty ones. An empty line ends a multi-line question/option text, so
+    # remember it on the line that follows.
+    lines_with_pages = []  # [(line, page_num, after_blank), ...]
+    after_blank = False
+    for page_num in sorted(page_texts.keys()):
+        page_text = page_texts[page_num]
         for line in page_text.split('\n'):
-            lines_with_pages.append((line, page_num))
+            line = line.strip()
+            if not line:
+                after_blank = True
+                continue
+            lines_with_pages.append((line, page_num, after_blank))
+            after_blank = False
 
     # Parse the text
-    current_section: Optional[Section] = None
-    current_question: Optional[Question] = None
+    current_section: Optional[dict] = None
+    current_question: Optional[dict] = None
     current_answers: dict[int, str] = {}
 
-    i = 0
-    while i < len(lines_with_pages):
-        line, page_num = lines_with_pages[i]
-        line = line.strip()
+    block: Optional[dict] = None  # question/option whose text is being collected
+    block_parts: list[str] = []
 
-        # Skip empty lines and page numbers
-        if not line or re.match(r'^\d+$', line):
-            i += 1
-            continue
+    classified = [_classify(line) for line, _, _ in lines_with_pages]
 
-        # Skip header lines
-        if line in ["TESTOVÉ ÚLOHY", "OBČANSKÝ ZÁKLAD"]:
-            i += 1
-            continue
+    for (line, page_num, after_blank), (kind, ends_block, *groups) in zip(lines_with_pages, classified):
+        # Collect multi-line question/option text until a line ends the block
+        if block is not None:
+            if not (ends_block or after_blank):
+                block_parts.append(line)
+                continue
+            block["text"] = clean_text(' '.join(block_parts))
+            block = None
 
-        # Check for section header
-        section_match = re.match(r'^(\d+)\.\s+([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ\s,0-9.]+)$', line)
-        if section_match:
-            section_text = section_match.group(2)
-            is_section = all(c.isupper() or not c.isalpha() for c in section_text)
-            if is_section:
-                # Save current question before moving to new section
-                if current_section and current_question and current_question.options:
-                    current_section.questions.append(current_question)
-                    current_question = None
-
-                # Save previous section
-                if current_section and current_section.questions:
-                    for q in current_section.questions:
-                        if q.id in current_answers:
-                            q.correct = current_answers[q.id]
-                    quiz_data.sections.append(current_section)
-
-                section_id = int(section_match.group(1))
-                section_name = section_match.group(2).strip()
-                current_section = Section(id=section_id, name=section_name)
+        if kind == SECTION:
+            # Save current question before moving to new section
+            if current_section and current_question and current_question["options"]:
+                current_section["questions"].append(current_question)
                 current_question = None
-                current_answers = {}
-                i += 1
-                continue
 
-        # Check for answers line
-        if "SPRÁVNÉ ŘEŠENÍ:" in line or "SPRÁVNÉ ŘEŠENÍ" in line:
-            if current_section and current_question and current_question.options:
-                current_section.questions.append(current_question)
+            # Save previous section
+            if current_section and current_section["questions"]:
+                for q in current_section["questions"]:
+                    if q["id"] in current_answers:
+                        q["correct"] = current_answers[q["id"]]
+                quiz_data["sections"].append(current_section)
+
+            section_id, section_name = groups
+            current_section = new_section(section_id, section_name)
+            current_question = None
+            current_answers = {}
+
+        elif kind == ANSWERS:
+            if current_section and current_question and current_question["options"]:
+                current_section["questions"].append(current_question)
                 current_question = None
 
-            answers_text = line
-            current_answers = parse_answers_line(answers_text)
-            i += 1
-            continue
+            current_answers = parse_answers_line(line)
 
-        # Check for question start
-        question_match = re.match(r'^(\d+)\.\s*(.*)', line)
-        if question_match:
+        elif kind == QUESTION:
             if current_section is None:
-                current_section = Section(id=0, name="(Pokračování)")
-            q_num = int(question_match.group(1))
-            q_text = question_match.group(2) if question_match.group(2) else ""
+                current_section = new_section(0, "(Pokračování)")
+            if current_question and current_question["options"]:
+                current_section["questions"].append(current_question)
 
-            if not line.isupper() and (q_num <= 10 or '?' in line):
-                if current_question and current_question.options:
-                    current_section.questions.append(current_question)
-
-                # Collect multi-line question text
-                j = i + 1
-                while j < len(lines_with_pages):
-                    next_line = lines_with_pages[j][0].strip()
-                    if (re.match(r'^[A-D]\)', next_line) or
-                        next_line.startswith("Datum aktualizace") or
-                        re.match(r'^\d+\.\s', next_line) or
-                        "SPRÁVNÉ ŘEŠENÍ" in next_line or
-                        not next_line):
-                        break
-                    q_text += " " + next_line if q_text else next_line
-                    j += 1
-
-                current_question = Question(id=q_num, text=clean_text(q_text), page=page_num)
-                i = j
-                continue
+            q_num, q_text = groups
+            current_question = new_question(q_num, "", page_num)
+            block = current_question
+            block_parts = [q_text] if q_text else []
+
+        elif kind == OPTION and current_question is not None:
+            label, opt_text = groups
+            option = new_option(label, "")
+            current_question["options"].append(option)
+            block = option
+            block_parts = [opt_text] if opt_text else []
 
-        # Check for option
-        option_match = re.match(r'^([A-D])\)\s*(.*)', line)
-        if option_match and current_question is not None:
-            label = option_match.group(1)
-            opt_text = option_match.group(2)
-
-            j = i + 1
-            while j < len(lines_with_pages):
-                next_line = lines_with_pages[j][0].strip()
-                if (re.match(r'^[A-D]\)', next_line) or
-                    next_line.startswith("Datum aktualizace") or
-                    re.match(r'^\d+\.\s+', next_line) or
-                    "SPRÁVNÉ ŘEŠENÍ" in next_line or
-                    not next_line):
-                    break
-                opt_text += " " + next_line
-                j += 1
-
-            current_question.options.append(Option(label=label, text=clean_text(opt_text)))
-            i = j
-            continue
-
-        # Check for date line
-        date_match = re.match(r'Datum aktualizace testové úlohy:\s*(.+)', line)
-        if date_match and current_question is not None:
-            current_question.date = date_match.group(1).strip()
-            i += 1
-            continue
-
-        i += 1
+        elif kind == DATE and current_question is not None:
+            current_question["date"] = groups[0]
+
+    if block is not None:
+        block["text"] = clean_text(' '.join(block_parts))
 
     # Don't forget the last section
-    if current_section and current_section.questions:
-        if current_question and current_question.options:
-            current_section.questions.append(current_question)
-        for q in current_section.questions:
-            if q.id in current_answers:
-                q.correct = current_answers[q.id]
-        quiz_data.sections.append(current_section)
-
-    # Group images by page for efficient lookup
-    images_by_page = {}
-    for img in all_images:
-        page = img['page']
-        if page not in images_by_page:
-            images_by_page[page] = []
-        images_by_page[page].append(img)
+    if current_section and current_section["questions"]:
+        if current_question and current_question["options"]:
+            current_section["questions"].append(current_question)
+        for q in current_section["questions"]:
+            if q["id"] in current_answers:
+                q["correct"] = current_answers[q["id"]]
+        quiz_data["sections"].append(current_section)
 
     # Sort images on each page by Y position (top to bottom), then X (left to right)
     # This gives reading order for 2x2 grids: top-left, top-right, bottom-left, bottom-right
+    by_sort_key = operator.itemgetter('sort_key')
     for page in images_by_page:
-        images_by_page[page].sort(key=lambda x: (
-            round(x['y_pos'] / 100) * 100,  # Group by row (100px tolerance)
-            x['rect'].x0 if x['rect'] else 0  # Then sort by X within row
-        ))
+        images_by_page[page].sort(key=by_sort_key)
 
     # Associate images with questions based on page
     assign_images_to_questions(quiz_data, images_by_page, images_dir.name)
@@ -307,7 +385,20 @@ def parse_pdf(pdf_path: Path, output_dir: Path) -> QuizData:
     return quiz_data
 
 
-def assign_images_to_questions(quiz_data: QuizData, images_by_page: dict, images_dir: str):
+# Keywords in question text that indicate an image reference
+IMAGE_KEYWORDS = [
+    "obrázku", "obrázek", "obrázků",  # picture (singular and plural)
+    "na obrázku", "na mapě",  # on the picture/map
+    "bankovce",  # on banknote (word order varies)
+    "tato socha", "této sochy",  # this statue
+    "tato panovnice",  # this ruler
+    "tato budova", "této budovy", "tato stavba",  # this building
+    "tato hora",  # this mountain
+]
+_IMG_KW_RE = re.compile('|'.join(map(re.escape, IMAGE_KEYWORDS)), re.IGNORECASE)
+
+
+def assign_images_to_questions(quiz_data: dict, images_by_page: dict, images_dir: str):
     """
     Assign images to questions using hybrid approach:
 
@@ -326,25 +417,14 @@ def assign_images_to_questions(quiz_data: QuizData, images_by_page: dict, images
         (17, 8),  # "tato hora" refers to previously mentioned mountain, not an image
     }
 
-    IMAGE_KEYWORDS = [
-        "obrázku", "obrázek", "obrázků",  # picture (singular and plural)
-        "na obrázku", "na mapě",  # on the picture/map
-        "bankovce",  # on banknote (word order varies)
-        "tato socha", "této sochy",  # this statue
-        "tato panovnice",  # this ruler
-        "tato budova", "této budovy", "tato stavba",  # this building
-        "tato hora",  # this mountain
-    ]
-
-    for section in quiz_data.sections:
-        for question in section.questions:
+    for section in quiz_data["sections"]:
+        for question in section["questions"]:
             # Skip known false positives
-            if (section.id, question.id) in EXCLUDE_IMAGE:
+            if (section["id"], question["id"]) in EXCLUDE_IMAGE:
                 continue
 
-            q_page = question.page
-            q_lower = question.text.lower()
-            mentions_image = any(kw in q_lower for kw in IMAGE_KEYWORDS)
+            q_page = question["page"]
+            mentions_image = _IMG_KW_RE.search(question["text"]) is not None
 
             # Get images from the question's page
             page_images = images_by_page.get(q_page, [])
@@ -358,51 +438,35 @@ def assign_images_to_questions(quiz_data: QuizData, images_by_page: dict, images
                 continue
 
             # Check option structure
-            short_options = all(len(opt.text) < 50 for opt in question.options)
-            has_four_options = len(question.options) == 4
+            short_options = all(len(opt["text"]) < 50 for opt in question["options"])
+            has_four_options = len(question["options"]) == 4
             has_four_plus_images = len(page_images) >= 4
 
             # Case 1: 4 short options + 4 images on SAME page + mentions image → assign to options
             if short_options and has_four_options and has_four_plus_images and mentions_image:
-                for idx, opt in enumerate(question.options):
+                for idx, opt in enumerate(question["options"]):
                     if idx < len(page_images):
-                        opt.image = f"{images_dir}/{page_images[idx]['filename']}"
+                        opt["image"] = f"{images_dir}/{page_images[idx]['filename']}"
 
             # Case 2: Single image → only if keywords present
             elif len(page_images) >= 1 and mentions_image:
-                question.image = f"{images_dir}/{page_images[0]['filename']}"
+                question["image"] = f"{images_dir}/{page_images[0]['filename']}"
 
 
-def convert_to_dict(quiz_data: QuizData) -> dict:
-    """Convert QuizData to a JSON-serializable dictionary."""
-    return {
-        "source_file": quiz_data.source_file,
-        "sections": [
-            {
-                "id": section.id,
-                "name": section.name,
-                "questions": [
-                    {
-                        "id": q.id,
-                        "text": q.text,
-                        "options": [
-                            {
-                                "label": opt.label,
-                                "text": opt.text,
-                                **({"image": opt.image} if opt.image else {})
-                            }
-                            for opt in q.options
-                        ],
-                        "correct": q.correct,
-                        **({"image": q.image} if q.image else {}),
-                        **({"date": q.date} if q.date else {})
-                    }
-                    for q in section.questions
-                ]
-            }
-            for section in quiz_data.sections
-        ]
-    }
+def convert_to_dict(quiz_data: dict) -> dict:
+    """Convert parsed quiz data to its JSON output (drop 'page' and unset image/date)."""
+    sections = []
+    for section in quiz_data["sections"]:
+        questions = []
+        for q in section["questions"]:
+            d = {k: v for k, v in q.items() if k != "page" and (v or k not in _OPTIONAL_KEYS)}
+            d["options"] = [{k: v for k, v in opt.items() if v or k not in _OPTIONAL_KEYS}
+                            for opt in q["options"]]
+            questions.append(d)
+
+        sections.append({**section, "questions": questions})
+
+    return {**quiz_data, "sections": sections}
 
 
 def process_pdf(pdf_path: Path, output_path: Optional[Path] = None) -> Path:
@@ -418,12 +482,12 @@ def process_pdf(pdf_path: Path, output_path: Optional[Path] = None) -> Path:
     # Convert to dict and save
     data = convert_to_dict(quiz_data)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     # Print summary
-    total_questions = sum(len(s.questions) for s in quiz_data.sections)
-    print(f"  Sections: {len(quiz_data.sections)}")
+    total_questions = sum(len(s["questions"]) for s in quiz_data["sections"])
+    print(f"  Sections: {len(quiz_data['sections'])}")
     print(f"  Questions: {total_questions}")
     print(f"  Output: {output_path.name}")
 
@@ -1,6 +1,8 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = []
+# dependencies = [
+#     "orjson>=3.9.0",
+# ]
 # ///
 """
 Validate image extraction and linking.
@@ -14,10 +16,12 @@ Usage:
     uv run validate_images.py [json_file]
 """
 
-import json
+import os
 import sys
 from pathlib import Path
 
+import orjson
+
 
 def find_json_file() -> Path:
     """Find the questions JSON file."""
@@ -91,11 +95,11 @@ def main():
     print("=" * 70)
 
     # Load JSON
-    with open(json_path) as f:
-        data = json.load(f)
+    data = orjson.loads(json_path.read_bytes())
 
     # Get image sets
-    dir_images = set(f.name for f in images_dir.iterdir() if f.is_file())
+    with os.scandir(images_dir) as entries:
+        dir_images = {e.name for e in entries if e.is_file()}
     json_images = get_referenced_images(data)
 
     # Calculate differences